@@ -8,17 +8,81 @@ Simple, reliable backup solution for your websites and databases.
 
 import os
 import sys
+import re
 import json
 import argparse
 import subprocess
 import shutil
+import io
+import collections
+import contextlib
+import stat
+import gzip
+import zlib
+import queue
+import threading
+import concurrent.futures
 from datetime import datetime
 from pathlib import Path
 import tarfile
 import logging
+import logging.handlers
+
+try:
+    import fcntl
+    import grp
+    import pwd
+except ImportError:  # Windows
+    fcntl = grp = pwd = None
+
+try:
+    from isal import igzip, isal_zlib
+except ImportError:  # python-isal is optional
+    igzip = None
+    isal_zlib = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, json is used instead
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional
+    zstandard = None
 
 __version__ = "1.0.0"
 
+# Read/write chunk size for streaming archives and dumps into the compressor
+COPY_BUFSIZE = 1024 * 1024
+
+# Chunks buffered between the read, compress and write stages of a dump
+PIPELINE_DEPTH = 4
+
+# zlib wbits value selecting a gzip header and trailer
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+# Amount of a dump's stderr kept for error messages
+STDERR_TAIL_SIZE = 64 * 1024
+
+# Timestamp embedded in every backup name
+TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S'
+BACKUP_TIMESTAMP_RE = re.compile(r'_(\d{8}_\d{6})(?:_\d+)?(?:\.|$)')
+
+# Formats DEFLATE cannot shrink further, stored as-is in gzip archives
+INCOMPRESSIBLE_EXTENSIONS = frozenset({
+    '.gz', '.tgz', '.zip', '.br', '.zst', '.xz', '.bz2', '.7z', '.rar',
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.avif',
+    '.mp3', '.mp4', '.mkv', '.webm', '.woff', '.woff2'
+})
+
+# Log file write buffer and number of records batched before writing
+LOG_BUFSIZE = 64 * 1024
+LOG_BATCH_SIZE = 1024
+
+# Linux-only fcntl command, exposed by the fcntl module since Python 3.10
+F_SETPIPE_SZ = getattr(fcntl, 'F_SETPIPE_SZ', 1031) if sys.platform.startswith('linux') else None
+
 
 class BackupConfig:
     """Configuration manager for backups"""
@@ -33,9 +97,10 @@ class BackupConfig:
             return self.create_default_config()
         
         try:
-            with open(self.config_file, 'r') as f:
-                return json.load(f)
-        except json.JSONDecodeError:
+            with open(self.config_file, 'rb') as f:
+                data = f.read()
+            return orjson.loads(data) if orjson is not None else json.loads(data)
+        except json.JSONDecodeError:  # orjson.JSONDecodeError subclasses it
             logging.error(f"Invalid JSON in {self.config_file}")
             sys.exit(1)
     
@@ -45,6 +110,8 @@ class BackupConfig:
             "backup_dir": "./backups",
             "retention_days": 7,
             "compression": "gz",
+            "backup_mode": "full",
+            "dedup_backend": "hardlink",
             "websites": [
                 {
                     "name": "example_site",
@@ -70,8 +137,7 @@ class BackupConfig:
             }
         }
         
-        with open(self.config_file, 'w') as f:
-            json.dump(default_config, f, indent=4)
+        self.write_config(default_config)
         
         print(f"✓ Default configuration created: {self.config_file}")
         print("  Please edit this file with your backup settings.")
@@ -79,8 +145,149 @@ class BackupConfig:
     
     def save_config(self):
         """Save current configuration to file"""
-        with open(self.config_file, 'w') as f:
-            json.dump(self.config, f, indent=4)
+        self.write_config(self.config)
+    
+    def write_config(self, config):
+        """Write a configuration dict to the config file as indented JSON"""
+        if orjson is not None:
+            with open(self.config_file, 'wb') as f:
+                f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+        else:
+            with open(self.config_file, 'w') as f:
+                json.dump(config, f, indent=4)
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """FileHandler writing through a large buffer instead of flushing every record"""
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=LOG_BUFSIZE, encoding=self.encoding)
+    
+    def emit(self, record):
+        # Same as StreamHandler.emit() minus its flush after each record
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class BatchingHandler(logging.handlers.MemoryHandler):
+    """MemoryHandler that flushes its target once per batch of records"""
+    
+    def flush(self):
+        super().flush()
+        with self.lock:
+            if self.target:
+                self.target.flush()
+
+
+class ArchiveStream(io.RawIOBase):
+    """Write-only stream forwarding to the current compressed segment of an archive"""
+    
+    def __init__(self):
+        super().__init__()
+        self.segment = None
+        self.offset = 0
+    
+    def writable(self):
+        return True
+    
+    def write(self, data):
+        self.segment.write(data)
+        self.offset += len(data)
+        return len(data)
+    
+    def tell(self):
+        return self.offset
+
+
+class CompressionPipeline:
+    """Read, compress and write a stream on separate threads with bounded queues"""
+    
+    def __init__(self, source, destination, compressor):
+        self.source = source
+        self.destination = destination
+        self.compressor = compressor
+        self.raw_chunks = queue.Queue(maxsize=PIPELINE_DEPTH)
+        self.compressed_chunks = queue.Queue(maxsize=PIPELINE_DEPTH)
+        self.failed = threading.Event()
+        self.error = None
+        self.bytes_written = 0
+    
+    def run(self):
+        """Run the pipeline to completion, reading on the calling thread"""
+        workers = [
+            threading.Thread(target=self.guard, args=(self.compress,), daemon=True),
+            threading.Thread(target=self.guard, args=(self.write,), daemon=True)
+        ]
+        for worker in workers:
+            worker.start()
+        
+        self.guard(self.read)
+        
+        for worker in workers:
+            worker.join()
+        
+        if self.error is not None:
+            raise self.error
+    
+    def guard(self, stage):
+        """Run a stage, stopping every other stage if it fails"""
+        try:
+            stage()
+        except Exception as e:
+            if self.error is None:
+                self.error = e
+            self.failed.set()
+    
+    def put(self, chunks, chunk):
+        """Queue a chunk unless the pipeline has failed"""
+        while not self.failed.is_set():
+            try:
+                chunks.put(chunk, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    def get(self, chunks):
+        """Get the next chunk, None at end of stream or if the pipeline has failed"""
+        while not self.failed.is_set():
+            try:
+                return chunks.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        return None
+    
+    def read(self):
+        while True:
+            chunk = self.source.read(COPY_BUFSIZE)
+            if not self.put(self.raw_chunks, chunk or None) or not chunk:
+                return
+    
+    def compress(self):
+        while True:
+            chunk = self.get(self.raw_chunks)
+            if chunk is None:
+                break
+            
+            data = self.compressor.compress(chunk)
+            if data and not self.put(self.compressed_chunks, data):
+                return
+        
+        if not self.failed.is_set():
+            self.put(self.compressed_chunks, self.compressor.flush())
+            self.put(self.compressed_chunks, None)
+    
+    def write(self):
+        while True:
+            data = self.get(self.compressed_chunks)
+            if data is None:
+                return
+            self.destination.write(data)
+            self.bytes_written += len(data)
 
 
 class BackupManager:
@@ -90,7 +297,15 @@ class BackupManager:
         self.config = config
         self.backup_dir = Path(config['backup_dir'])
         self.backup_dir.mkdir(parents=True, exist_ok=True)
+        self.snapshot_dir = self.backup_dir / 'snapshots'
+        self.run_timestamp = None
+        self.reserved_paths = set()
+        self.reserved_paths_lock = threading.Lock()
+        self.owner_names = {}
+        self.thread_state = threading.local()
         self.setup_logging()
+        self.compression = self.get_compression()
+        self.extension = 'zst' if self.compression == 'zstd' else 'gz'
     
     def setup_logging(self):
         """Setup logging configuration"""
@@ -98,19 +313,257 @@ class BackupManager:
         log_dir.mkdir(exist_ok=True)
         
         log_file = log_dir / f"backup_{datetime.now().strftime('%Y%m%d')}.log"
+        log_format = '%(asctime)s - %(levelname)s - %(message)s'
+        
+        # Records are written to disk in batches, errors immediately;
+        # logging.shutdown() flushes whatever is left at exit
+        file_handler = BufferedFileHandler(log_file)
+        file_handler.setFormatter(logging.Formatter(log_format))
         
         logging.basicConfig(
             level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
+            format=log_format,
             handlers=[
-                logging.FileHandler(log_file),
+                BatchingHandler(LOG_BATCH_SIZE, flushLevel=logging.ERROR, target=file_handler),
                 logging.StreamHandler()
             ]
         )
     
     def get_timestamp(self):
-        """Get formatted timestamp for backup naming"""
-        return datetime.now().strftime('%Y%m%d_%H%M%S')
+        """Get formatted timestamp for backup naming (shared by a whole run)"""
+        if self.run_timestamp:
+            return self.run_timestamp
+        return datetime.now().strftime(TIMESTAMP_FORMAT)
+    
+    def get_backup_path(self, directory, stem, suffix=''):
+        """Reserve a unique backup path, appending _1, _2... on name collisions"""
+        with self.reserved_paths_lock:
+            backup_path = directory / f"{stem}{suffix}"
+            index = 0
+            while backup_path in self.reserved_paths or backup_path.exists():
+                index += 1
+                backup_path = directory / f"{stem}_{index}{suffix}"
+            
+            self.reserved_paths.add(backup_path)
+            return backup_path
+    
+    def get_compression(self):
+        """Get the compression format to use: gz or zstd"""
+        compression = self.config.get('compression', 'gz')
+        
+        if compression == 'zstd' and zstandard is None:
+            logging.warning("zstandard module not installed (pip install zstandard), using gzip")
+            return 'gz'
+        
+        return 'zstd' if compression == 'zstd' else 'gz'
+    
+    def get_compression_level(self):
+        """Get compression level (gzip: 1-9, zstd: 1-22)"""
+        return self.config.get('compression_level', 3 if self.compression == 'zstd' else 1)
+    
+    def get_isal_compression_level(self):
+        """Get compression level mapped onto ISA-L's 0-3 range"""
+        return min(self.get_compression_level(), isal_zlib.ISAL_BEST_COMPRESSION)
+    
+    def get_zstd_compressor(self):
+        """Get the calling thread's ZstdCompressor, reused across its backups"""
+        # ZstdCompressor is not safe for concurrent use, but each pool worker
+        # can keep one and skip reallocating its context for every backup
+        cctx = getattr(self.thread_state, 'zstd_compressor', None)
+        
+        if cctx is None:
+            # threads=-1 runs zstd's own multi-threaded compression
+            cctx = zstandard.ZstdCompressor(level=self.get_compression_level(), threads=-1)
+            self.thread_state.zstd_compressor = cctx
+        
+        return cctx
+    
+    def create_compressor(self):
+        """Create an incremental compressor object (compress/flush) for the configured format"""
+        if self.compression == 'zstd':
+            return self.get_zstd_compressor().compressobj()
+        if isal_zlib is not None:
+            return isal_zlib.compressobj(self.get_isal_compression_level(), isal_zlib.DEFLATED, GZIP_WBITS)
+        return zlib.compressobj(self.get_compression_level(), zlib.DEFLATED, GZIP_WBITS)
+    
+    def get_compressor_command(self):
+        """Get gzip-compatible compressor command, preferring parallel pigz"""
+        for program in ('pigz', 'gzip'):
+            if shutil.which(program):
+                return [program, '-c', f"-{self.get_compression_level()}"]
+        return None
+    
+    def open_compressed(self, f):
+        """Open a compressed stream appending to f (zstd, or gzip using ISA-L when available)"""
+        if self.compression == 'zstd':
+            return self.get_zstd_compressor().stream_writer(f, closefd=False)
+        if igzip is not None:
+            return igzip.IGzipFile(fileobj=f, mode='wb', compresslevel=self.get_isal_compression_level())
+        return gzip.GzipFile(fileobj=f, mode='wb', compresslevel=self.get_compression_level())
+    
+    @contextlib.contextmanager
+    def open_archive_segment(self, f):
+        """Open a compressed stream appending to f, through pigz/gzip when worthwhile"""
+        compressor_cmd = self.get_compressor_command() if self.compression == 'gz' else None
+        
+        # In-process ISA-L beats a gzip subprocess, but not multi-core pigz
+        if compressor_cmd and (compressor_cmd[0] == 'pigz' or igzip is None):
+            # Compression runs outside the Python process (and on all cores with pigz)
+            with subprocess.Popen(compressor_cmd, stdin=subprocess.PIPE, stdout=f, stderr=subprocess.PIPE, bufsize=COPY_BUFSIZE) as compressor:
+                self.widen_pipe(compressor.stdin)
+                yield compressor.stdin
+                compressor_output, compressor_error = compressor.communicate()
+            
+            if compressor.returncode != 0:
+                raise Exception(f"{compressor_cmd[0]} error: {compressor_error.decode()}")
+        else:
+            with self.open_compressed(f) as compressed:
+                yield compressed
+    
+    def write_archive(self, f, site_path, arcname):
+        """Write a compressed tar archive of a website to f"""
+        stream = ArchiveStream()
+        # Batch tar's 512-byte headers and 16 KiB data copies into 1 MiB
+        # compressor writes; flushed before every segment change
+        buffered = io.BufferedWriter(stream, COPY_BUFSIZE)
+        # zstd stores incompressible blocks raw on its own, gzip needs help
+        deferred = [] if self.compression == 'gz' else None
+        
+        with self.open_archive_segment(f) as segment:
+            stream.segment = segment
+            # Plain "w" mode writes straight through, so nothing is left
+            # buffered in the tar layer when the segment changes
+            tar = tarfile.open(fileobj=buffered, mode='w')
+            self.add_tree_to_archive(tar, site_path, arcname, deferred)
+            if not deferred:
+                tar.close()
+            buffered.flush()
+        
+        if deferred:
+            # Already-compressed files go last, in a stored (level 0) gzip
+            # member: gzip and tar read concatenated members as one stream
+            with gzip.GzipFile(fileobj=f, mode='wb', compresslevel=0) as segment:
+                stream.segment = segment
+                # Headers come from a fresh lstat() now, since the site kept
+                # changing while its compressible part was being archived
+                inodes = {}
+                for path, name in deferred:
+                    try:
+                        self.add_path_to_archive(tar, path, name, inodes)
+                    except FileNotFoundError:
+                        # Cache plugins regenerate and delete their *.html.gz pages
+                        logging.warning(f"  Skipped file removed during backup: {path}")
+                tar.close()
+                buffered.flush()
+    
+    def add_tree_to_archive(self, tar, site_path, arcname, deferred=None):
+        """Add a file tree to an archive, reading each file with a large buffer
+        
+        Already-compressed files are appended to deferred instead, as
+        (path, arcname) pairs, when given.
+        """
+        def raise_walk_error(error):
+            raise error
+        
+        # (st_dev, st_ino) -> arcname of the first copy of each hard-linked file
+        inodes = {}
+        self.add_path_to_archive(tar, str(site_path), arcname, inodes, deferred)
+        
+        # A website path may also be a single file, or a symlink (such as a
+        # deploy's current -> releases/N) that is archived as the link only
+        if site_path.is_symlink() or not site_path.is_dir():
+            return
+        
+        for root, dirs, files in os.walk(site_path, onerror=raise_walk_error):
+            dirs.sort()
+            rel_root = os.path.relpath(root, site_path)
+            arc_root = arcname if rel_root == '.' else os.path.join(arcname, rel_root)
+            
+            for name in dirs + sorted(files):
+                self.add_path_to_archive(tar, os.path.join(root, name), os.path.join(arc_root, name), inodes, deferred)
+    
+    def get_owner_names(self, uid, gid):
+        """Get (user, group) names for an owner, cached for the manager's lifetime"""
+        names = self.owner_names.get((uid, gid))
+        
+        if names is None:
+            uname = gname = ''
+            try:
+                uname = pwd.getpwuid(uid).pw_name if pwd else ''
+            except KeyError:
+                pass
+            try:
+                gname = grp.getgrgid(gid).gr_name if grp else ''
+            except KeyError:
+                pass
+            names = self.owner_names[(uid, gid)] = (uname, gname)
+        
+        return names
+    
+    def add_path_to_archive(self, tar, path, arcname, inodes, deferred=None):
+        """Add a single entry (not its children) to an archive, or defer it"""
+        # Build the header from one lstat() instead of TarFile.gettarinfo(),
+        # which also looks up user and group names for every file
+        file_stat = os.lstat(path)
+        mode = file_stat.st_mode
+        tarinfo = tarfile.TarInfo(arcname)
+        
+        if stat.S_ISREG(mode):
+            inode = (file_stat.st_dev, file_stat.st_ino)
+            if file_stat.st_nlink > 1 and inode in inodes:
+                tarinfo.type = tarfile.LNKTYPE
+                tarinfo.linkname = inodes[inode]
+            else:
+                tarinfo.type = tarfile.REGTYPE
+                tarinfo.size = file_stat.st_size
+                if file_stat.st_nlink > 1:
+                    inodes[inode] = arcname
+        elif stat.S_ISDIR(mode):
+            tarinfo.type = tarfile.DIRTYPE
+        elif stat.S_ISLNK(mode):
+            tarinfo.type = tarfile.SYMTYPE
+            tarinfo.linkname = os.readlink(path)
+        else:
+            # Sockets, device files and FIFOs are not website content
+            return
+        
+        tarinfo.mode = stat.S_IMODE(mode)
+        tarinfo.mtime = file_stat.st_mtime
+        tarinfo.uid = file_stat.st_uid
+        tarinfo.gid = file_stat.st_gid
+        tarinfo.uname, tarinfo.gname = self.get_owner_names(file_stat.st_uid, file_stat.st_gid)
+        
+        if not tarinfo.isreg():
+            tar.addfile(tarinfo)
+        elif (deferred is not None and file_stat.st_nlink == 1
+                and os.path.splitext(path)[1].lower() in INCOMPRESSIBLE_EXTENSIONS):
+            # Hard-linked files stay in place so links never precede their target
+            deferred.append((path, arcname))
+        else:
+            self.add_file_to_archive(tar, path, tarinfo)
+    
+    def add_file_to_archive(self, tar, path, tarinfo):
+        """Add a regular file's header and contents to an archive"""
+        with open(path, 'rb', buffering=COPY_BUFSIZE) as f:
+            if hasattr(os, 'posix_fadvise'):
+                # Aggressive read-ahead; the site's pages are deliberately not
+                # dropped afterwards since they may be hot for the live site
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            tar.addfile(tarinfo, f)
+    
+    def drop_page_cache(self, f):
+        """Write a finished backup to disk and evict it from the page cache"""
+        if not hasattr(os, 'posix_fadvise'):
+            return
+        
+        # DONTNEED only evicts clean pages, so sync the data first
+        f.flush()
+        try:
+            os.fdatasync(f.fileno())
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            # Unsupported on some FUSE/network targets (sshfs, rclone)
+            pass
     
     def backup_website(self, website):
         """Backup website files"""
@@ -124,14 +577,20 @@ class BackupManager:
             return None
         
         timestamp = self.get_timestamp()
-        backup_name = f"{website['name']}_website_{timestamp}.tar.gz"
-        backup_path = self.backup_dir / backup_name
+        
+        backup_mode = website.get('backup_mode', self.config.get('backup_mode', 'full'))
+        if backup_mode == 'incremental':
+            return self.snapshot_website(website, site_path, timestamp)
+        
+        backup_path = self.get_backup_path(self.backup_dir, f"{website['name']}_website_{timestamp}", f".tar.{self.extension}")
+        backup_name = backup_path.name
         
         logging.info(f"Backing up website: {website['name']}")
         
         try:
-            with tarfile.open(backup_path, "w:gz") as tar:
-                tar.add(site_path, arcname=website['name'])
+            with open(backup_path, 'wb') as f:
+                self.write_archive(f, site_path, website['name'])
+                self.drop_page_cache(f)
             
             backup_size = backup_path.stat().st_size / (1024 * 1024)  # MB
             logging.info(f"✓ Website backup completed: {backup_name} ({backup_size:.2f} MB)")
@@ -139,13 +598,137 @@ class BackupManager:
         
         except Exception as e:
             logging.error(f"✗ Website backup failed: {str(e)}")
+            if backup_path.exists():
+                backup_path.unlink()
             return None
     
+    def widen_pipe(self, pipe):
+        """Grow a kernel pipe buffer to COPY_BUFSIZE to cut read/write syscalls"""
+        if F_SETPIPE_SZ is None:
+            return
+        
+        try:
+            fcntl.fcntl(pipe.fileno(), F_SETPIPE_SZ, COPY_BUFSIZE)
+        except OSError:
+            # Above /proc/sys/fs/pipe-max-size for unprivileged users
+            pass
+    
+    def get_latest_snapshot(self, prefix):
+        """Get the most recent snapshot directory starting with prefix"""
+        if not self.snapshot_dir.exists():
+            return None
+        
+        with os.scandir(self.snapshot_dir) as entries:
+            names = [entry.name for entry in entries if entry.name.startswith(prefix) and entry.is_dir()]
+        
+        # Timestamps sort lexicographically
+        return self.snapshot_dir / max(names) if names else None
+    
+    def snapshot_website(self, website, site_path, timestamp):
+        """Backup website files as a snapshot directory sharing data with earlier copies"""
+        dedup_backend = website.get('dedup_backend', self.config.get('dedup_backend', 'hardlink'))
+        if dedup_backend not in ('hardlink', 'reflink', 'off'):
+            logging.error(f"Unsupported dedup backend: {dedup_backend}")
+            return None
+        
+        prefix = f"{website['name']}_website_"
+        snapshot_path = self.get_backup_path(self.snapshot_dir, f"{prefix}{timestamp}")
+        snapshot_name = snapshot_path.name
+        program = 'cp' if dedup_backend == 'reflink' else 'rsync'
+        
+        logging.info(f"Backing up website (incremental, {dedup_backend}): {website['name']}")
+        
+        try:
+            self.snapshot_dir.mkdir(exist_ok=True)
+            previous = self.get_latest_snapshot(prefix) if dedup_backend == 'hardlink' else None
+            # Created up front so a single-file site is copied into a
+            # snapshot directory rather than becoming the snapshot itself
+            snapshot_path.mkdir()
+            
+            if dedup_backend == 'reflink':
+                # Copy-on-write clone of the live site on btrfs/XFS/ZFS,
+                # a regular copy on other filesystems
+                source = f"{site_path}/." if site_path.is_dir() else str(site_path)
+                cmd = [program, '-a', '--reflink=auto', source, str(snapshot_path)]
+            else:
+                cmd = [program, '-aH']
+                if previous:
+                    # Unchanged files become hard links into the previous snapshot
+                    cmd.append(f"--link-dest={previous.resolve()}")
+                source = f"{site_path}/" if site_path.is_dir() else str(site_path)
+                cmd += [source, f"{snapshot_path}/"]
+            
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            if result.returncode != 0:
+                raise Exception(f"{program} error: {result.stderr.decode()}")
+            
+            base = f" (based on {previous.name})" if previous else ""
+            logging.info(f"✓ Website snapshot completed: {snapshot_name}{base}")
+            return snapshot_path
+        
+        except FileNotFoundError:
+            logging.error(f"✗ {program} not found. Please install it for incremental backups.")
+        except Exception as e:
+            logging.error(f"✗ Website snapshot failed: {str(e)}")
+        
+        # Never leave a partial (or, for reflink, empty) snapshot behind as
+        # a retained backup or the next --link-dest base
+        if snapshot_path.is_dir():
+            shutil.rmtree(snapshot_path)
+        elif snapshot_path.exists():
+            snapshot_path.unlink()
+        return None
+    
+    def drain_stderr(self, pipe, tail):
+        """Read a pipe to EOF, keeping only its last STDERR_TAIL_SIZE bytes in tail"""
+        size = 0
+        while True:
+            chunk = pipe.read1(STDERR_TAIL_SIZE)
+            if not chunk:
+                return
+            
+            tail.append(chunk)
+            size += len(chunk)
+            while size - len(tail[0]) >= STDERR_TAIL_SIZE:
+                size -= len(tail.popleft())
+    
+    def dump_and_compress(self, cmd, backup_path, env=None):
+        """Run a database dump command, compress its output in-process and return the compressed size"""
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env, bufsize=COPY_BUFSIZE) as dump_process:
+            self.widen_pipe(dump_process.stdout)
+            
+            # Drain stderr alongside stdout so a chatty dump can never block
+            # on it, without holding more than its tail in memory
+            stderr_tail = collections.deque()
+            stderr_reader = threading.Thread(target=self.drain_stderr, args=(dump_process.stderr, stderr_tail), daemon=True)
+            stderr_reader.start()
+            
+            # Overlap waiting on the dump, compression and disk writes
+            with open(backup_path, 'wb') as f:
+                pipeline = CompressionPipeline(dump_process.stdout, f, self.create_compressor())
+                try:
+                    pipeline.run()
+                except Exception:
+                    dump_process.kill()
+                    raise
+                finally:
+                    dump_process.wait()
+                    stderr_reader.join()
+                
+                # A failed dump gets unlinked by the caller, don't sync it first
+                if dump_process.returncode != 0:
+                    dump_error = b''.join(stderr_tail)[-STDERR_TAIL_SIZE:]
+                    raise Exception(f"{cmd[0]} error: {dump_error.decode(errors='replace')}")
+                
+                self.drop_page_cache(f)
+        
+        return pipeline.bytes_written
+    
     def backup_mysql_database(self, db_config):
         """Backup MySQL/MariaDB database"""
         timestamp = self.get_timestamp()
-        backup_name = f"{db_config['name']}_mysql_{timestamp}.sql.gz"
-        backup_path = self.backup_dir / backup_name
+        backup_path = self.get_backup_path(self.backup_dir, f"{db_config['name']}_mysql_{timestamp}", f".sql.{self.extension}")
+        backup_name = backup_path.name
         
         logging.info(f"Backing up MySQL database: {db_config['database']}")
         
@@ -164,21 +747,9 @@ class BackupManager:
             ]
             
             # Execute mysqldump and compress
-            with open(backup_path, 'wb') as f:
-                dump_process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                gzip_process = subprocess.Popen(['gzip'], stdin=dump_process.stdout, stdout=f, stderr=subprocess.PIPE)
-                dump_process.stdout.close()
-                
-                gzip_output, gzip_error = gzip_process.communicate()
-                dump_output, dump_error = dump_process.communicate()
-                
-                if dump_process.returncode != 0:
-                    raise Exception(f"mysqldump error: {dump_error.decode()}")
-                
-                if gzip_process.returncode != 0:
-                    raise Exception(f"gzip error: {gzip_error.decode()}")
+            bytes_written = self.dump_and_compress(cmd, backup_path)
             
-            backup_size = backup_path.stat().st_size / (1024 * 1024)  # MB
+            backup_size = bytes_written / (1024 * 1024)  # MB
             logging.info(f"✓ MySQL backup completed: {backup_name} ({backup_size:.2f} MB)")
             return backup_path
         
@@ -194,8 +765,8 @@ class BackupManager:
     def backup_postgresql_database(self, db_config):
         """Backup PostgreSQL database"""
         timestamp = self.get_timestamp()
-        backup_name = f"{db_config['name']}_postgresql_{timestamp}.sql.gz"
-        backup_path = self.backup_dir / backup_name
+        backup_path = self.get_backup_path(self.backup_dir, f"{db_config['name']}_postgresql_{timestamp}", f".sql.{self.extension}")
+        backup_name = backup_path.name
         
         logging.info(f"Backing up PostgreSQL database: {db_config['database']}")
         
@@ -217,21 +788,9 @@ class BackupManager:
             ]
             
             # Execute pg_dump and compress
-            with open(backup_path, 'wb') as f:
-                dump_process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
-                gzip_process = subprocess.Popen(['gzip'], stdin=dump_process.stdout, stdout=f, stderr=subprocess.PIPE)
-                dump_process.stdout.close()
-                
-                gzip_output, gzip_error = gzip_process.communicate()
-                dump_output, dump_error = dump_process.communicate()
-                
-                if dump_process.returncode != 0:
-                    raise Exception(f"pg_dump error: {dump_error.decode()}")
-                
-                if gzip_process.returncode != 0:
-                    raise Exception(f"gzip error: {gzip_error.decode()}")
+            bytes_written = self.dump_and_compress(cmd, backup_path, env=env)
             
-            backup_size = backup_path.stat().st_size / (1024 * 1024)  # MB
+            backup_size = bytes_written / (1024 * 1024)  # MB
             logging.info(f"✓ PostgreSQL backup completed: {backup_name} ({backup_size:.2f} MB)")
             return backup_path
         
@@ -260,6 +819,17 @@ class BackupManager:
             logging.error(f"Unsupported database type: {db_type}")
             return None
     
+    def parse_backup_time(self, name):
+        """Get the creation time embedded in a backup name, None if it has none"""
+        match = BACKUP_TIMESTAMP_RE.search(name)
+        if not match:
+            return None
+        
+        try:
+            return datetime.strptime(match.group(1), TIMESTAMP_FORMAT).timestamp()
+        except ValueError:
+            return None
+    
     def cleanup_old_backups(self):
         """Remove backups older than retention period"""
         retention_days = self.config.get('retention_days', 7)
@@ -271,16 +841,37 @@ class BackupManager:
         removed_count = 0
         freed_space = 0
         
-        for backup_file in self.backup_dir.glob('*'):
-            if backup_file.is_file() and backup_file.suffix in ['.gz', '.sql', '.tar']:
-                file_age = current_time - backup_file.stat().st_mtime
+        # Backup names carry their creation time, so most files are only
+        # stat'ed when deleted (scandir caches the result per entry)
+        with os.scandir(self.backup_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(('.gz', '.zst', '.sql', '.tar')) or not entry.is_file():
+                    continue
+                
+                created = self.parse_backup_time(entry.name)
+                if created is None:
+                    created = entry.stat().st_mtime
                 
-                if file_age > retention_seconds:
-                    file_size = backup_file.stat().st_size
-                    backup_file.unlink()
+                if current_time - created > retention_seconds:
+                    freed_space += entry.stat().st_size
+                    os.unlink(entry.path)
                     removed_count += 1
-                    freed_space += file_size
-                    logging.info(f"  Removed old backup: {backup_file.name}")
+                    logging.info(f"  Removed old backup: {entry.name}")
+        
+        # rsync copies the site's own mtime onto snapshots, so only
+        # directories named with a timestamp are considered
+        if self.snapshot_dir.exists():
+            with os.scandir(self.snapshot_dir) as entries:
+                for entry in entries:
+                    created = self.parse_backup_time(entry.name)
+                    if created is None or not entry.is_dir():
+                        continue
+                    
+                    if current_time - created > retention_seconds:
+                        # Only blocks not hard-linked from newer snapshots are freed
+                        shutil.rmtree(entry.path)
+                        removed_count += 1
+                        logging.info(f"  Removed old snapshot: {entry.name}")
         
         if removed_count > 0:
             freed_mb = freed_space / (1024 * 1024)
@@ -297,21 +888,28 @@ class BackupManager:
         success_count = 0
         fail_count = 0
         
-        # Backup websites
-        for website in self.config.get('websites', []):
-            result = self.backup_website(website)
-            if result:
-                success_count += 1
-            else:
-                fail_count += 1
+        # One timestamp for every backup of this run
+        self.run_timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
         
-        # Backup databases
-        for database in self.config.get('databases', []):
-            result = self.backup_database(database)
-            if result:
-                success_count += 1
-            else:
-                fail_count += 1
+        tasks = [(self.backup_website, website) for website in self.config.get('websites', [])]
+        tasks += [(self.backup_database, database) for database in self.config.get('databases', [])]
+        
+        # Backups are independent and spend most of their time in tar/zlib
+        # (which release the GIL) or in dump/compressor subprocesses
+        max_workers = self.config.get('parallel_jobs') or os.cpu_count() or 1
+        
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(backup, item) for backup, item in tasks]
+                
+                for future in concurrent.futures.as_completed(futures):
+                    if future.result():
+                        success_count += 1
+                    else:
+                        fail_count += 1
+        finally:
+            # Don't let a later run on this manager reuse a stale timestamp
+            self.run_timestamp = None
         
         # Cleanup old backups
         self.cleanup_old_backups()